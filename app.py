@@ -1,40 +1,133 @@
-from flask import Flask, render_template
-from flask_socketio import SocketIO
+from flask import Flask, Response, render_template, request
 from flask_cors import CORS
-import random
-import time
-import threading
+from asgiref.wsgi import WsgiToAsgi
+import socketio
+import asyncio
+import gzip
+import numpy as np
+import orjson
 
 app = Flask(__name__)
 CORS(app)  # Enable Cross-Origin Resource Sharing
-socketio = SocketIO(app, cors_allowed_origins="*")
+
+class _OrjsonCodec:
+    """json module stand-in so Socket.IO encodes packets with orjson"""
+
+    @staticmethod
+    def dumps(obj, **kwargs):
+        # orjson output is always compact, so separators etc. are not needed
+        return orjson.dumps(obj).decode()
+
+    loads = staticmethod(orjson.loads)
+
+# WebSocket only: clients never fall back to HTTP long-polling
+sio = socketio.AsyncServer(
+    async_mode="asgi",
+    cors_allowed_origins="*",
+    json=_OrjsonCodec,
+    transports=["websocket"]
+)
+
+# Readings are coalesced into one sensor_update frame per batch interval
+_emit_q = asyncio.Queue(maxsize=2000)
+_BATCH_INTERVAL = 0.2
+_BATCH_MAX = 16
+
+# Simulated readings are drawn this many ticks at a time
+_rng = np.random.default_rng()
+_RNG_BATCH = 256
+_POSTURES = np.array(["Good", "Bad"])
+_AIR_QUALITY = np.array(["Good", "Moderate", "Unhealthy", "Hazardous"])
+
+# The dashboard is static, so render and compress it once at startup
+with app.app_context():
+    _index_html = render_template('index.html').encode()
+_index_html_gz = gzip.compress(_index_html)
 
 @app.route('/')
 def index():
-    return render_template('index.html')
+    # Indexing returns the quality, so "gzip;q=0" counts as a refusal
+    if request.accept_encodings["gzip"] > 0:
+        return Response(
+            _index_html_gz,
+            mimetype="text/html",
+            headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"}
+        )
+    return Response(_index_html, mimetype="text/html", headers={"Vary": "Accept-Encoding"})
 
-def generate_sensor_data():
+@app.after_request
+def add_cache_headers(response):
+    response.headers.setdefault("Cache-Control", "public, max-age=60")
+    return response
+
+def _simulated_readings():
+    """Yield one reading per tick, generating _RNG_BATCH ticks' worth per refill"""
+    while True:
+        n = _RNG_BATCH
+        # tolist() converts to native types once per batch, ready for JSON
+        columns = zip(
+            _rng.integers(50, 101, size=n).tolist(),  # UV sensor value
+            _rng.integers(60, 121, size=n).tolist(),  # Heart rate in bpm
+            _rng.integers(30, 101, size=n).tolist(),  # Hydration level percentage
+            _rng.choice(_POSTURES, n).tolist(),  # Posture indicator
+            _rng.integers(90, 141, size=n).tolist(),  # Systolic pressure
+            _rng.integers(60, 91, size=n).tolist(),  # Diastolic pressure
+            np.round(_rng.uniform(70, 140, size=n), 2).tolist(),  # Glucose level (mg/dL)
+            np.round(_rng.uniform(36.0, 38.5, size=n), 1).tolist(),  # Body temperature in °C
+            _rng.choice(_AIR_QUALITY, n).tolist()  # Air quality
+        )
+        for uv, hr, hydration, posture, systolic, diastolic, glucose, temp, air in columns:
+            yield {
+                "UV": uv,
+                "Heart Rate": hr,
+                "Hydration Level": hydration,
+                "Posture": posture,
+                "Blood Pressure": f"{systolic}/{diastolic} mmHg",
+                "Glucose Level": glucose,
+                "Body Temperature": f"{temp}°C",
+                "Air Quality (Gas Levels)": air
+            }
+
+async def generate_sensor_data():
     """Simulate sensor readings for multiple sensors and emit them via WebSocket."""
+    readings = _simulated_readings()
     while True:
-        data = {
-            "UV": random.randint(50, 100),  # UV sensor value
-            "Heart Rate": random.randint(60, 120),  # Heart rate in bpm
-            "Hydration Level": random.randint(30, 100),  # Hydration level percentage
-            "Posture": random.choice(["Good", "Bad"]),  # Posture indicator
-            "Blood Pressure": f"{random.randint(90, 140)}/{random.randint(60, 90)} mmHg",  # Systolic/Diastolic
-            "Glucose Level": round(random.uniform(70, 140), 2),  # Glucose level (mg/dL)
-            "Body Temperature": f"{round(random.uniform(36.0, 38.5), 1)}°C",  # Body temperature in °C
-            "Air Quality (Gas Levels)": random.choice(["Good", "Moderate", "Unhealthy", "Hazardous"])  # Air quality
-        }
-        # Emit the data with an event name matching the one used in the HTML (sensor_update)
-        socketio.emit("sensor_update", data)
-        time.sleep(2)
+        data = next(readings)
+        try:
+            _emit_q.put_nowait(data)
+        except asyncio.QueueFull:
+            pass  # Drop the reading rather than stall the simulator
+        await sio.sleep(2)
+
+async def _emit_worker():
+    """Drain queued readings and emit them as a single batched sensor_update"""
+    while True:
+        items = [await _emit_q.get()]
+        while len(items) < _BATCH_MAX:
+            try:
+                items.append(_emit_q.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        # Event name matches the one used in the HTML (sensor_update)
+        await sio.emit("sensor_update", {"count": len(items), "items": items})
+        await sio.sleep(_BATCH_INTERVAL)
+
+def start_sensor_simulation():
+    """Schedule the sensor simulation and emit worker on the server's event loop"""
+    sio.start_background_task(_emit_worker)
+    sio.start_background_task(generate_sensor_data)
+
+# Socket.IO handles its own path; every other request falls through to Flask
+asgi_app = socketio.ASGIApp(
+    sio,
+    other_asgi_app=WsgiToAsgi(app),
+    on_startup=start_sensor_simulation
+)
 
 if __name__ == '__main__':
-    # Start sensor simulation in a separate background thread
-    sensor_thread = threading.Thread(target=generate_sensor_data)
-    sensor_thread.daemon = True
-    sensor_thread.start()
+    import uvicorn
 
-    # Run the Flask app with SocketIO support
-    socketio.run(app, debug=True, host='127.0.0.1', port=5000)
\ No newline at end of file
+    # Equivalent to: uvicorn app:asgi_app
+    # The "auto" loop uses uvloop when it is installed, plain asyncio otherwise.
+    # WebSocket frames are compressed by uvicorn's default permessage-deflate.
+    uvicorn.run("app:asgi_app", host='127.0.0.1', port=5000, loop="auto")
@@ -0,0 +1,12 @@
+import random
+
+async def run(msg_queue, tick):
+    sensor_name = "Air Quality (Gas Levels)"
+    gases = ["Good", "Moderate", "Unhealthy", "Hazardous"]
+    template = {"sensor": sensor_name, "value": None}
+    while True:
+        await tick.wait()
+        value = random.choice(gases)  # Simulating air quality
+        msg = template.copy()
+        msg["value"] = value
+        await msg_queue.put(msg)
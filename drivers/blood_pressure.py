@@ -0,0 +1,22 @@
+import random
+
+async def run(msg_queue, tick):
+    sensor_name = "Blood Pressure"
+    # Constant fields are built once; each tick copies and fills in the readings
+    template = {
+        "sensor": sensor_name,
+        "systolic": None,
+        "diastolic": None,
+        "unit": "mmHg",
+        "value": None
+    }
+    while True:
+        await tick.wait()
+        systolic = random.randint(90, 140)  # Systolic Pressure
+        diastolic = random.randint(60, 90)  # Diastolic Pressure
+        
+        msg = template.copy()
+        msg["systolic"] = systolic
+        msg["diastolic"] = diastolic
+        msg["value"] = f"{systolic}/{diastolic} mmHg"
+        await msg_queue.put(msg)
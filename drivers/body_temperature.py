@@ -0,0 +1,11 @@
+import random
+
+async def run(msg_queue, tick):
+    sensor_name = "Body Temperature"
+    template = {"sensor": sensor_name, "value": None}
+    while True:
+        await tick.wait()
+        value = round(random.uniform(36.0, 38.5), 1)  # Simulating body temperature (°C)
+        msg = template.copy()
+        msg["value"] = f"{value}°C"
+        await msg_queue.put(msg)
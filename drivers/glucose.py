@@ -0,0 +1,11 @@
+import random
+
+async def run(msg_queue, tick):
+    sensor_name = "Glucose Level"
+    template = {"sensor": sensor_name, "value": None}
+    while True:
+        await tick.wait()
+        value = random.uniform(70, 140)  # Simulating glucose levels (mg/dL)
+        msg = template.copy()
+        msg["value"] = round(value, 2)
+        await msg_queue.put(msg)
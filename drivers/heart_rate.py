@@ -1,10 +1,11 @@
-import time
 import random
 
-def run(msg_queue):
+async def run(msg_queue, tick):
     sensor_name = "Heart Rate"
+    template = {"sensor": sensor_name, "value": None}
     while True:
+        await tick.wait()
         value = random.randint(60, 120)  # Simulating a normal heart rate range
-        msg = {"sensor": sensor_name, "value": value}
-        msg_queue.put(msg)
-        time.sleep(2)
+        msg = template.copy()
+        msg["value"] = value
+        await msg_queue.put(msg)
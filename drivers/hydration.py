@@ -0,0 +1,11 @@
+import random
+
+async def run(msg_queue, tick):
+    sensor_name = "Hydration Level"
+    template = {"sensor": sensor_name, "value": None}
+    while True:
+        await tick.wait()
+        value = random.randint(30, 100)  # Simulating hydration level percentage
+        msg = template.copy()
+        msg["value"] = value
+        await msg_queue.put(msg)
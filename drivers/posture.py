@@ -0,0 +1,12 @@
+import random
+
+async def run(msg_queue, tick):
+    sensor_name = "Posture"
+    postures = ["Good", "Bad"]
+    template = {"sensor": sensor_name, "value": None}
+    while True:
+        await tick.wait()
+        value = random.choice(postures)  # Simulating posture indicator
+        msg = template.copy()
+        msg["value"] = value
+        await msg_queue.put(msg)
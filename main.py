@@ -1,10 +1,16 @@
+import asyncio
+import collections
+import concurrent.futures
 import threading
 import queue
 import time
 import importlib
+import itertools
 import logging
-import uuid
-from typing import Dict, List, Any, Callable
+from typing import Dict, List, Any, Callable, Optional
+
+# Interval between kernel ticks, in seconds; drivers sample once per tick
+TICK_INTERVAL = 2.0
 
 # Configure logging
 logging.basicConfig(
@@ -21,18 +27,20 @@ class Process:
         self.target = target
         self.args = args
         self.kwargs = kwargs
-        self.thread = None
+        self.kernel = None
+        self.future = None
         self.running = False
+        self._exited = threading.Event()
         self.message_queue = queue.Queue()
         
     def start(self):
-        """Start the process thread"""
+        """Start the process as a task on the kernel loop, or on the kernel's thread pool"""
         self.running = True
-        self.thread = threading.Thread(
-            target=self._run_wrapper,
-            daemon=True
-        )
-        self.thread.start()
+        if asyncio.iscoroutinefunction(self.target):
+            # None if the kernel has not started yet; it launches us from start()
+            self.future = self.kernel._launch_async(self)
+        else:
+            self.future = self.kernel._pool.submit(self._run_wrapper)
         
     def _run_wrapper(self):
         """Wrapper to handle exceptions and process termination"""
@@ -42,6 +50,23 @@ class Process:
             logging.error(f"Process {self.name} (PID: {self.pid}) crashed: {e}")
         finally:
             self.running = False
+            # Let the kernel reap us without scanning every process
+            self.kernel._exit_queue.put(self.pid)
+            self._exited.set()
+            
+    async def _run_async_wrapper(self):
+        """Coroutine counterpart of _run_wrapper for async targets"""
+        try:
+            await self.target(self, *self.args, **self.kwargs)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logging.error(f"Process {self.name} (PID: {self.pid}) crashed: {e}")
+        finally:
+            self.running = False
+            # Let the kernel reap us without scanning every process
+            self.kernel._exit_queue.put(self.pid)
+            self._exited.set()
             
     def send_message(self, message: Dict[str, Any]):
         """Add a message to this process's queue"""
@@ -57,15 +82,68 @@ class Process:
     def terminate(self):
         """Terminate the process"""
         self.running = False
-        # Cannot directly terminate a thread in Python,
+        if self.future is None:
+            # Never launched, so no wrapper will signal the exit
+            self._exited.set()
+        else:
+            # Cancels async processes outright, and sync ones still waiting for a worker
+            if self.future.cancel() and not asyncio.iscoroutinefunction(self.target):
+                # Never reached a worker, so _run_wrapper will not signal the exit
+                self._exited.set()
+        # Cannot directly terminate a running thread in Python,
         # but we can set a flag that the process should check
 
+class MessageQueue:
+    """Single-consumer queue for the kernel loop: a deque plus an asyncio wake-up"""
+    
+    def __init__(self):
+        self._dq = collections.deque()
+        self._wake = asyncio.Event()
+        
+    def put_nowait(self, message: Dict[str, Any]):
+        """Add a message from the kernel's event loop thread"""
+        self._dq.append(message)
+        self._wake.set()
+        
+    async def put(self, message: Dict[str, Any]):
+        """Add a message from a coroutine (asyncio.Queue compatible)"""
+        self.put_nowait(message)
+        
+    def put_threadsafe(self, message: Dict[str, Any], loop: Optional[asyncio.AbstractEventLoop]):
+        """Add a message from any thread, waking the consumer only if it sleeps"""
+        self._dq.append(message)
+        # Without a loop the kernel has not started; its first get() sees the deque
+        if loop is not None and not self._wake.is_set():
+            loop.call_soon_threadsafe(self._wake.set)
+            
+    async def get(self) -> Dict[str, Any]:
+        """Wait for and remove the next message"""
+        while not self._dq:
+            # Clear before re-checking so a concurrent put_threadsafe always wakes us
+            self._wake.clear()
+            if not self._dq:
+                await self._wake.wait()
+        return self._dq.popleft()
+        
+    async def get_batch(self) -> List[Dict[str, Any]]:
+        """Wait for a message, then remove everything queued behind it as well"""
+        batch = [await self.get()]
+        popleft = self._dq.popleft
+        while self._dq:
+            batch.append(popleft())
+        return batch
+        
+    def __len__(self):
+        return len(self._dq)
+
 class Service:
     """Base class for all microkernel services"""
     
     def __init__(self, name: str):
         self.name = name
         self.kernel = None
+        # Operation name -> handler(message); subclasses fill this in
+        self._ops: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {}
         
     def initialize(self, kernel):
         """Initialize the service with a reference to the kernel"""
@@ -73,7 +151,15 @@ class Service:
         
     def process_message(self, message: Dict[str, Any]) -> Dict[str, Any]:
         """Process a message sent to this service"""
-        raise NotImplementedError("Service must implement process_message")
+        operation = message.get("operation")
+        handler = self._ops.get(operation)
+        if handler is None:
+            return {
+                "status": "error",
+                "operation": operation,
+                "error": "Unknown operation"
+            }
+        return handler(message)
 
 class FileSystemService(Service):
     """A simple in-memory file system service"""
@@ -81,46 +167,41 @@ class FileSystemService(Service):
     def __init__(self):
         super().__init__("filesystem")
         self.files = {}
-        
-    def process_message(self, message: Dict[str, Any]) -> Dict[str, Any]:
-        operation = message.get("operation")
-        
-        if operation == "write":
-            path = message.get("path")
-            content = message.get("content")
-            self.files[path] = content
-            return {"status": "success", "operation": "write", "path": path}
-            
-        elif operation == "read":
-            path = message.get("path")
-            if path in self.files:
-                return {
-                    "status": "success", 
-                    "operation": "read", 
-                    "path": path, 
-                    "content": self.files[path]
-                }
-            else:
-                return {
-                    "status": "error", 
-                    "operation": "read", 
-                    "path": path, 
-                    "error": "File not found"
-                }
-                
-        elif operation == "list":
+        self._ops = {
+            "read": self._read,
+            "write": self._write,
+            "list": self._list
+        }
+        
+    def _write(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        path = message.get("path")
+        content = message.get("content")
+        self.files[path] = content
+        return {"status": "success", "operation": "write", "path": path}
+        
+    def _read(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        path = message.get("path")
+        if path in self.files:
             return {
                 "status": "success", 
-                "operation": "list", 
-                "files": list(self.files.keys())
+                "operation": "read", 
+                "path": path, 
+                "content": self.files[path]
             }
-            
         else:
             return {
                 "status": "error", 
-                "operation": operation, 
-                "error": "Unknown operation"
+                "operation": "read", 
+                "path": path, 
+                "error": "File not found"
             }
+            
+    def _list(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "status": "success", 
+            "operation": "list", 
+            "files": list(self.files.keys())
+        }
 
 class DeviceManagerService(Service):
     """Manages device drivers and hardware access"""
@@ -129,6 +210,11 @@ class DeviceManagerService(Service):
         super().__init__("device_manager")
         self.devices = {}
         self.driver_processes = {}
+        self._ops = {
+            "load_driver": self._load_driver,
+            "unload_driver": self._unload_driver,
+            "list_devices": self._list_devices
+        }
         
     def initialize(self, kernel):
         super().initialize(kernel)
@@ -151,33 +237,16 @@ class DeviceManagerService(Service):
         except ImportError:
             logging.warning("No drivers package found")
         
-    def process_message(self, message: Dict[str, Any]) -> Dict[str, Any]:
-        operation = message.get("operation")
+    def _list_devices(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "status": "success",
+            "operation": "list_devices",
+            "devices": self.devices
+        }
         
-        if operation == "load_driver":
-            driver_name = message.get("driver")
-            return self._load_driver(driver_name)
-            
-        elif operation == "unload_driver":
-            driver_name = message.get("driver")
-            return self._unload_driver(driver_name)
-            
-        elif operation == "list_devices":
-            return {
-                "status": "success",
-                "operation": "list_devices",
-                "devices": self.devices
-            }
-            
-        else:
-            return {
-                "status": "error",
-                "operation": operation,
-                "error": "Unknown operation"
-            }
-            
-    def _load_driver(self, driver_name: str) -> Dict[str, Any]:
+    def _load_driver(self, message: Dict[str, Any]) -> Dict[str, Any]:
         """Load a device driver as a process"""
+        driver_name = message.get("driver")
         if driver_name not in self.devices:
             return {
                 "status": "error",
@@ -199,12 +268,12 @@ class DeviceManagerService(Service):
             driver_module = importlib.import_module(f"drivers.{driver_name}")
             
             # Create a process for the driver
-            pid = str(uuid.uuid4())
+            pid = self.kernel.new_pid()
             process = Process(
                 pid=pid,
                 name=f"driver-{driver_name}",
-                target=driver_module.run,
-                args=(self.kernel,)
+                target=driver_process,
+                args=(driver_module.run, self.kernel.system_queue)
             )
             
             # Register and start the process
@@ -233,8 +302,9 @@ class DeviceManagerService(Service):
                 "error": str(e)
             }
             
-    def _unload_driver(self, driver_name: str) -> Dict[str, Any]:
+    def _unload_driver(self, message: Dict[str, Any]) -> Dict[str, Any]:
         """Unload a device driver"""
+        driver_name = message.get("driver")
         if driver_name not in self.devices:
             return {
                 "status": "error",
@@ -284,65 +354,95 @@ class ProcessScheduler(Service):
     
     def __init__(self):
         super().__init__("scheduler")
-        
-    def process_message(self, message: Dict[str, Any]) -> Dict[str, Any]:
-        operation = message.get("operation")
-        
-        if operation == "list_processes":
-            processes = self.kernel.get_processes()
-            return {
-                "status": "success",
-                "operation": "list_processes",
-                "processes": [
-                    {
-                        "pid": pid,
-                        "name": process.name,
-                        "running": process.running
-                    }
-                    for pid, process in processes.items()
-                ]
-            }
-            
-        elif operation == "terminate_process":
-            pid = message.get("pid")
-            success = self.kernel.terminate_process(pid)
-            return {
-                "status": "success" if success else "error",
-                "operation": "terminate_process",
-                "pid": pid,
-                "error": None if success else "Process not found or could not be terminated"
-            }
-            
-        else:
-            return {
-                "status": "error",
-                "operation": operation,
-                "error": "Unknown operation"
-            }
+        self._ops = {
+            "list_processes": self._list_processes,
+            "terminate_process": self._terminate_process
+        }
+        
+    def _list_processes(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        processes = self.kernel.get_processes()
+        return {
+            "status": "success",
+            "operation": "list_processes",
+            "processes": [
+                {
+                    "pid": pid,
+                    "name": process.name,
+                    "running": process.running
+                }
+                for pid, process in processes.items()
+            ]
+        }
+        
+    def _terminate_process(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        pid = message.get("pid")
+        success = self.kernel.terminate_process(pid)
+        return {
+            "status": "success" if success else "error",
+            "operation": "terminate_process",
+            "pid": pid,
+            "error": None if success else "Process not found or could not be terminated"
+        }
 
 class MicroKernel:
     """Enhanced microkernel implementation"""
     
     def __init__(self):
-        self.system_queue = queue.Queue()
+        self.system_queue = MessageQueue()
+        self.loop = None
         self.running = True
         self.services = {}
         self.processes = {}
         self.logger = logging.getLogger("Kernel")
+        self._loop_task = None
+        self._ticker_task = None
+        # Async processes started before the kernel loop exists
+        self._pending_starts: List[Process] = []
+        self._pending_lock = threading.Lock()
+        self.tick = asyncio.Event()
+        self._pid_counter = itertools.count(1)
+        self._exit_queue = queue.SimpleQueue()
+        self._pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=32,
+            thread_name_prefix="kernel"
+        )
+        # Bound methods cached at registration for the message dispatch path
+        self._service_dispatch: Dict[str, Callable] = {}
+        self._inboxes: Dict[str, Callable] = {}
         
-    def start(self):
-        """Start the kernel"""
+    async def start(self):
+        """Start the kernel on the running event loop"""
         self.logger.info("Kernel starting...")
+        with self._pending_lock:
+            self.loop = asyncio.get_running_loop()
+            pending, self._pending_starts = self._pending_starts, []
         
         # Register core services
         self._register_core_services()
         
+        # Launch async processes created before the loop existed
+        for process in pending:
+            if process.running:
+                process.future = self._launch_async(process)
+        
         # Start the main kernel loop
-        threading.Thread(
-            target=self.kernel_loop, 
-            daemon=True, 
-            name="KernelLoop"
-        ).start()
+        self._loop_task = asyncio.create_task(self.kernel_loop(), name="KernelLoop")
+        self._ticker_task = asyncio.create_task(self._ticker(), name="KernelTicker")
+        
+        # Reap terminated processes on a timer rather than in the message path
+        self.loop.call_later(1.0, self._periodic_cleanup)
+        
+    def _launch_async(self, process: Process) -> Optional[concurrent.futures.Future]:
+        """Schedule an async process on the kernel loop, or defer it until start()"""
+        with self._pending_lock:
+            if self.loop is None:
+                self._pending_starts.append(process)
+                return None
+        return asyncio.run_coroutine_threadsafe(process._run_async_wrapper(), self.loop)
+        
+    async def wait(self):
+        """Wait until the kernel loop exits"""
+        await asyncio.wait({self._loop_task})
         
     def _register_core_services(self):
         """Register the core services"""
@@ -354,13 +454,20 @@ class MicroKernel:
         """Register a service with the kernel"""
         service.initialize(self)
         self.services[service.name] = service
+        self._service_dispatch[service.name] = service.process_message
         self.logger.info(f"Service '{service.name}' registered")
         
     def register_process(self, process: Process):
         """Register a process with the kernel"""
+        process.kernel = self
         self.processes[process.pid] = process
+        self._inboxes[process.pid] = process.send_message
         self.logger.info(f"Process '{process.name}' (PID: {process.pid}) registered")
         
+    def new_pid(self) -> str:
+        """Allocate a process ID (sequential, so PIDs sort in creation order)"""
+        return f"pid-{next(self._pid_counter)}"
+        
     def get_processes(self) -> Dict[str, Process]:
         """Get all registered processes"""
         return self.processes
@@ -371,64 +478,100 @@ class MicroKernel:
             process = self.processes[pid]
             process.terminate()
             self.logger.info(f"Process '{process.name}' (PID: {pid}) terminated")
-            # Remove process from registry after giving it time to exit
-            time.sleep(0.1)
-            if pid in self.processes:
-                del self.processes[pid]
+            # Wait for the process to exit, unless that would block the loop it runs on
+            if not self._on_loop_thread():
+                process._exited.wait(timeout=2.0)
+            self.processes.pop(pid, None)
+            self._inboxes.pop(pid, None)
             return True
         return False
         
-    def kernel_loop(self):
+    async def _ticker(self):
+        """Pulse self.tick every TICK_INTERVAL so all drivers wake together"""
+        # Schedule against the loop's monotonic clock so ticks do not drift
+        next_tick = self.loop.time()
+        while True:
+            next_tick += TICK_INTERVAL
+            now = self.loop.time()
+            if next_tick <= now:
+                # The loop was blocked past a tick; drop missed ticks rather than replay them
+                next_tick = now + TICK_INTERVAL
+            await asyncio.sleep(next_tick - now)
+            # Waiters are released by set(); clearing re-arms it for the next tick
+            self.tick.set()
+            self.tick.clear()
+            
+    def _on_loop_thread(self) -> bool:
+        """Whether the caller is running on the kernel's event loop"""
+        try:
+            return asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            return False
+            
+    async def kernel_loop(self):
         """Main kernel loop"""
         self.logger.info("Kernel loop started")
         
         while self.running:
-            try:
-                message = self.system_queue.get(timeout=1)
-                self.logger.debug(f"Received message: {message}")
-                self.process_message(message)
-            except queue.Empty:
-                # Just continue the loop
-                pass
-            
-            # Cleanup terminated processes
+            # Dispatch everything that arrived since the last wake-up in one pass
+            batch = await self.system_queue.get_batch()
+            process_message = self.process_message
+            for message in batch:
+                process_message(message)
+            
+    def _periodic_cleanup(self):
+        """Cleanup terminated processes once a second while the kernel runs"""
+        if not self._exit_queue.empty():
             self._cleanup_processes()
+        if self.running:
+            self.loop.call_later(1.0, self._periodic_cleanup)
             
     def _cleanup_processes(self):
-        """Remove terminated processes from the registry"""
-        terminated = [pid for pid, proc in self.processes.items() if not proc.running]
-        for pid in terminated:
-            self.logger.info(f"Cleaning up terminated process {pid}")
-            del self.processes[pid]
+        """Remove processes that have exited from the registry"""
+        while True:
+            try:
+                pid = self._exit_queue.get_nowait()
+            except queue.Empty:
+                break
+            # Terminated processes may already have been removed
+            if self.processes.pop(pid, None) is not None:
+                self.logger.info(f"Cleaning up terminated process {pid}")
+            self._inboxes.pop(pid, None)
             
     def process_message(self, message: Dict[str, Any]):
         """Process a message from the system queue"""
+        # Lazy %-formatting: these run per message and are usually disabled
+        self.logger.debug("Received message: %s", message)
         service_name = message.get("service")
-        sender_pid = message.get("sender")
         reply_to = message.get("reply_to")
+        handler = self._service_dispatch.get(service_name)
+        inbox = self._inboxes.get(reply_to) if reply_to else None
         
-        if service_name in self.services:
-            service = self.services[service_name]
-            self.logger.debug(f"Routing message to service: {service_name}")
+        if handler is not None:
+            self.logger.debug("Routing message to service: %s", service_name)
             
             # Process the message
-            result = service.process_message(message)
+            result = handler(message)
             
             # Send reply if needed
-            if reply_to and reply_to in self.processes:
+            if inbox is not None:
                 reply = {
                     "type": "reply",
                     "original_request": message,
                     "result": result,
                     "service": service_name
                 }
-                self.processes[reply_to].send_message(reply)
+                inbox(reply)
                 
+        elif service_name is None and "sensor" in message:
+            # Raw reading posted by a driver; nothing to route
+            pass
+            
         else:
             self.logger.warning(f"Service not found: {service_name}")
             
             # Send error reply
-            if reply_to and reply_to in self.processes:
+            if inbox is not None:
                 error_reply = {
                     "type": "reply",
                     "original_request": message,
@@ -437,15 +580,19 @@ class MicroKernel:
                         "error": f"Service not found: {service_name}"
                     }
                 }
-                self.processes[reply_to].send_message(error_reply)
+                inbox(error_reply)
                 
     def send_system_message(self, message: Dict[str, Any]):
-        """Send a message to the system queue"""
-        self.system_queue.put(message)
+        """Send a message to the system queue (safe to call from any thread)"""
+        if self._on_loop_thread():
+            # Coroutine processes can set the wake-up event directly
+            self.system_queue.put_nowait(message)
+        else:
+            self.system_queue.put_threadsafe(message, self.loop)
         
     def create_process(self, name: str, target: Callable, args=(), kwargs={}) -> str:
         """Create a new process"""
-        pid = str(uuid.uuid4())
+        pid = self.new_pid()
         process = Process(pid=pid, name=name, target=target, args=args, kwargs=kwargs)
         self.register_process(process)
         process.start()
@@ -456,14 +603,22 @@ class MicroKernel:
         self.logger.info("Kernel shutting down...")
         self.running = False
         
+        # Wake the kernel loop out of its blocking get() and stop the ticker
+        if self._loop_task is not None:
+            self.loop.call_soon_threadsafe(self._loop_task.cancel)
+            self.loop.call_soon_threadsafe(self._ticker_task.cancel)
+        
         # Terminate all processes
         for pid in list(self.processes.keys()):
             self.terminate_process(pid)
             
+        # Sync processes exit cooperatively once they see running=False
+        self._pool.shutdown(wait=False, cancel_futures=True)
+            
         self.logger.info("Kernel shutdown complete")
 
 # Example driver function
-def example_driver_process(process, kernel):
+async def example_driver_process(process, kernel):
     """Example driver process function"""
     logger = logging.getLogger(f"Driver-{process.name}")
     logger.info("Driver started")
@@ -478,15 +633,21 @@ def example_driver_process(process, kernel):
             "sender": process.pid
         })
         
-        # Check for messages
-        message = process.receive_message(timeout=1)
+        await kernel.tick.wait()
+        
+        # Check for messages that arrived since the last tick, without blocking the loop
+        message = process.receive_message(timeout=0)
         if message:
             logger.info(f"Received message: {message}")
-            
-        time.sleep(2)
         
     logger.info("Driver stopped")
 
+async def driver_process(process, run, msg_queue):
+    """Host a driver module's run() coroutine as a kernel process"""
+    logger = logging.getLogger(f"Driver-{process.name}")
+    logger.info("Driver started")
+    await run(msg_queue, process.kernel.tick)
+
 # Flask API integration function
 def create_flask_api(kernel):
     """Create a Flask API for interacting with the microkernel"""
@@ -574,10 +735,10 @@ def create_flask_api(kernel):
         
     return app
 
-if __name__ == "__main__":
+async def main():
     # Create and start the kernel
     kernel = MicroKernel()
-    kernel.start()
+    await kernel.start()
     
     # Create a test process
     kernel.create_process(
@@ -597,11 +758,14 @@ if __name__ == "__main__":
         )
         flask_thread.start()
         
-        # Keep the main thread running
-        while True:
-            time.sleep(1)
-            
-    except KeyboardInterrupt:
-        pass
+        # Keep the kernel running until its loop exits
+        await kernel.wait()
+        
     finally:
         kernel.stop()
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass